@@ -10,6 +10,11 @@ const state = {
   editingQuestionId: null,
 };
 
+// True while handleExportExcel is running. The export yields to the browser
+// between questions, so anything that mutates sets/questions is refused
+// until it finishes (see isExportBusy).
+let exportInProgress = false;
+
 // ==== DOM HELPERS ====
 const $ = (id) => document.getElementById(id);
 
@@ -49,7 +54,21 @@ const statusEl = $("status");
 const STORAGE_KEY = "ib_question_entry_state";
 const INSTRUCTIONS_STATE_KEY = "ib_question_entry_instructions_expanded";
 
+// Typing in the exam field would otherwise re-serialize the whole state
+// (embedded images included) on every keystroke
+const SAVE_DEBOUNCE_MS = 400;
+let pendingSaveTimer = null;
+
+function scheduleSave() {
+  if (pendingSaveTimer !== null) clearTimeout(pendingSaveTimer);
+  pendingSaveTimer = setTimeout(saveStateToStorage, SAVE_DEBOUNCE_MS);
+}
+
 function saveStateToStorage() {
+  if (pendingSaveTimer !== null) {
+    clearTimeout(pendingSaveTimer);
+    pendingSaveTimer = null;
+  }
   try {
     const dataToSave = {
       exam: state.exam,
@@ -60,12 +79,6 @@ function saveStateToStorage() {
     };
     const jsonString = JSON.stringify(dataToSave);
     localStorage.setItem(STORAGE_KEY, jsonString);
-    console.log("State saved to localStorage:", {
-      exam: dataToSave.exam,
-      setsCount: dataToSave.sets.length,
-      questionsCount: dataToSave.questions.length,
-      currentSetId: dataToSave.currentSetId
-    });
   } catch (err) {
     console.error("Failed to save state to localStorage:", err);
     // Check if it's a quota exceeded error
@@ -84,7 +97,6 @@ function loadStateFromStorage() {
     }
 
     const data = JSON.parse(saved);
-    console.log("Loaded state from localStorage:", data);
     
     // Restore state with validation
     if (data.exam && typeof data.exam === 'object') {
@@ -103,7 +115,6 @@ function loadStateFromStorage() {
       state.editingQuestionId = data.editingQuestionId;
     }
 
-    console.log("State restored:", state);
     return true;
   } catch (err) {
     console.error("Failed to load state from localStorage:", err);
@@ -139,18 +150,63 @@ function uuid() {
   });
 }
 
+const ANSWER_TYPE_LABELS = {
+  0: "0 - No answer expected (context only)",
+  1: "1 - Open text answer",
+  2: "2 - Multiple choice",
+};
+
 function formatAnswerTypeLabel(v) {
-  const value = Number(v);
-  if (value === 1) return "1 - Open text answer";
-  if (value === 2) return "2 - Multiple choice";
-  return "0 - No answer expected (context only)";
+  return ANSWER_TYPE_LABELS[Number(v)] || ANSWER_TYPE_LABELS[0];
 }
 
-function htmlToPlainText(html) {
+// Scratch HTML is parsed inside an inert document: it has no browsing
+// context, so embedded <img> data is never fetched or decoded.
+const scratchDoc = document.implementation.createHTMLDocument("");
+
+function parseHtmlFragment(html) {
+  const container = scratchDoc.createElement("div");
+  container.innerHTML = html;
+  return container;
+}
+
+// Strings without any of these characters contain no markup or entities, so
+// parsing and re-serializing them returns them unchanged
+const HTML_SIGNIFICANT_CHARS_RE = /[<>&\r\0\u00a0]/;
+
+// Line breaks and block-level tags separate words; inline tags (b, sub, span,
+// ...) do not, so "H<sub>2</sub>O" previews as "H2O"
+const HTML_BLOCK_TAG_RE =
+  /<\/?(?:br|p|div|li|ul|ol|tr|td|th|table|thead|tbody|h[1-6]|blockquote|pre|hr)\b[^>]*>/gi;
+const HTML_TAG_RE = /<[^>]*>/g;
+const HTML_ENTITY_RE = /&(#x[0-9a-f]+|#\d+|[a-z]+);/gi;
+// The editors' innerHTML only ever escapes these named entities in text
+const NAMED_ENTITIES = { amp: "&", lt: "<", gt: ">", quot: '"', apos: "'", nbsp: " " };
+
+function decodeEntity(match, body) {
+  if (body[0] === "#") {
+    const code =
+      body[1] === "x" || body[1] === "X"
+        ? parseInt(body.slice(2), 16)
+        : parseInt(body.slice(1), 10);
+    return code > 0 && code <= 0x10ffff ? String.fromCodePoint(code) : match;
+  }
+  const ch = NAMED_ENTITIES[body.toLowerCase()];
+  return ch === undefined ? match : ch;
+}
+
+// Truncated plain-text preview for the question tables. Built with regexes
+// only (tags stripped, entities decoded, whitespace collapsed), so neither
+// the markup nor base64 image data is ever handed to the HTML parser.
+function htmlPreview(html, limit) {
   if (!html) return "";
-  const temp = document.createElement("div");
-  temp.innerHTML = html;
-  return (temp.textContent || "").trim();
+  const text = html
+    .replace(HTML_BLOCK_TAG_RE, " ")
+    .replace(HTML_TAG_RE, "")
+    .replace(HTML_ENTITY_RE, decodeEntity)
+    .replace(/\s+/g, " ")
+    .trim();
+  return text.length > limit ? text.slice(0, limit) + "…" : text;
 }
 
 // ==== EXAM VALIDATION ====
@@ -178,6 +234,21 @@ function validateExamInfo() {
 }
 
 // ==== SETS ====
+// id -> set index. Rebuilt lazily whenever state.sets is replaced or
+// changes length (sets are only ever pushed, filtered or cleared).
+let setLookup = { source: null, size: -1, byId: new Map() };
+
+function getSetById(id) {
+  if (setLookup.source !== state.sets || setLookup.size !== state.sets.length) {
+    setLookup = {
+      source: state.sets,
+      size: state.sets.length,
+      byId: new Map(state.sets.map((s) => [s.id, s])),
+    };
+  }
+  return setLookup.byId.get(id);
+}
+
 function refreshSetSelect() {
   setSelectEl.innerHTML = "";
   const placeholder = document.createElement("option");
@@ -214,7 +285,7 @@ function renderSetsList() {
 }
 
 function ensureSetSelected() {
-  if (!state.currentSetId || !state.sets.find((s) => s.id === state.currentSetId)) {
+  if (!state.currentSetId || !getSetById(state.currentSetId)) {
     alert("Please create and select a question set first.");
     return false;
   }
@@ -222,6 +293,7 @@ function ensureSetSelected() {
 }
 
 function handleNewSet() {
+  if (isExportBusy()) return;
   const label = window.prompt("Set label (e.g., Question 10):", "");
   if (!label || !label.trim()) return;
   const section = window.prompt("Section (optional, e.g., A or B):", "") || "";
@@ -235,11 +307,12 @@ function handleNewSet() {
 }
 
 function handleEditSet() {
+  if (isExportBusy()) return;
   if (!state.currentSetId) {
     alert("Select a set to edit.");
     return;
   }
-  const set = state.sets.find((s) => s.id === state.currentSetId);
+  const set = getSetById(state.currentSetId);
   if (!set) return;
   const newLabel = window.prompt("Set label:", set.label) ?? "";
   if (!newLabel.trim()) {
@@ -265,11 +338,12 @@ function handleEditSet() {
 }
 
 function handleDeleteSet() {
+  if (isExportBusy()) return;
   if (!state.currentSetId) {
     alert("Select a set to delete.");
     return;
   }
-  const set = state.sets.find((s) => s.id === state.currentSetId);
+  const set = getSetById(state.currentSetId);
   if (!set) return;
   const ok = window.confirm(
     `Delete set "${set.label}" and all its questions? This cannot be undone.`
@@ -277,7 +351,7 @@ function handleDeleteSet() {
   if (!ok) return;
 
   state.sets = state.sets.filter((s) => s.id !== set.id);
-  state.questions = state.questions.filter((q) => q.set_id !== set.id);
+  removeQuestionsWhere((q) => q.set_id === set.id);
   state.currentSetId = state.sets[0]?.id || null;
 
   saveStateToStorage();
@@ -288,34 +362,221 @@ function handleDeleteSet() {
 }
 
 // ==== RICH TEXT HELPERS ====
+// Same character set String.prototype.trim strips
+const TRIMMABLE_CHAR_RE = /\s/;
+
 function getEditorHtml(editor) {
   if (!editor) return "";
-  return editor.innerHTML.trim();
+  const html = editor.innerHTML;
+  // Only copy the (possibly multi-MB) string when there is something to trim
+  if (
+    html &&
+    (TRIMMABLE_CHAR_RE.test(html[0]) ||
+      TRIMMABLE_CHAR_RE.test(html[html.length - 1]))
+  ) {
+    return html.trim();
+  }
+  return html;
 }
 
+function getEditorPlainText(editor) {
+  if (!editor || !editor.firstChild) return "";
+  return (editor.textContent || "").trim();
+}
+
+// Toolbar command -> [execCommand name, value]
+const EDITOR_COMMANDS = {
+  bold: ["bold", null],
+  italic: ["italic", null],
+  monospace: ["fontName", "Courier New"],
+  normal: ["removeFormat", null],
+};
+
 function applyEditorCommand(command, editor) {
   if (!editor) return;
+  const spec = EDITOR_COMMANDS[command];
+  if (!spec) return;
   editor.focus();
-  if (command === "bold" || command === "italic") {
-    document.execCommand(command, false, null);
-  } else if (command === "monospace") {
-    document.execCommand("fontName", false, "Courier New");
-  } else if (command === "normal") {
-    document.execCommand("removeFormat", false, null);
+  document.execCommand(spec[0], false, spec[1]);
+}
+
+// Recently read image files, keyed by file identity, so dropping the same
+// diagram into both editors only reads and encodes it once.
+const IMAGE_DATA_URL_CACHE_LIMIT = 16;
+const imageDataUrlCache = new Map();
+
+// Image re-encoding on insert (GIF/SVG are left untouched)
+const MAX_IMAGE_WIDTH = 1600;
+const JPEG_QUALITY = 0.85;
+const WEBP_QUALITY = 0.9;
+// PNG/BMP files that don't need downscaling are only re-encoded lossily above
+// this size; smaller ones (line-art diagrams, text screenshots) stay lossless
+const LOSSY_REENCODE_MIN_BYTES = 1024 * 1024;
+// Files above this are rejected before being read at all
+const MAX_IMAGE_FILE_BYTES = 25 * 1024 * 1024;
+// Images above this many pixels are decoded pre-scaled to MAX_IMAGE_WIDTH
+const MAX_DECODE_PIXELS = 4000000;
+const REENCODABLE_IMAGE_TYPES = new Set([
+  "image/png",
+  "image/jpeg",
+  "image/webp",
+  "image/bmp",
+]);
+
+function imageFileKey(file) {
+  return `${file.name}|${file.size}|${file.lastModified}|${file.type}`;
+}
+
+function readFileAsDataUrl(file) {
+  return new Promise((resolve, reject) => {
+    const reader = new FileReader();
+    reader.onload = (e) => resolve(e.target.result);
+    reader.onerror = () => reject(reader.error);
+    reader.readAsDataURL(file);
+  });
+}
+
+function loadImageElement(file) {
+  return new Promise((resolve, reject) => {
+    const url = URL.createObjectURL(file);
+    const img = new Image();
+    img.onload = () => {
+      URL.revokeObjectURL(url);
+      resolve(img);
+    };
+    img.onerror = () => {
+      URL.revokeObjectURL(url);
+      reject(new Error("Could not decode image"));
+    };
+    img.src = url;
+  });
+}
+
+/**
+ * Decode an image file for re-encoding.
+ * probe is the file's loaded <img> (see loadImageElement), used for the source
+ * dimensions. Resolves to { image, width, height }; image may already be
+ * scaled down for very large files.
+ */
+async function decodeImageFile(file, probe) {
+  // naturalWidth/Height are EXIF-corrected, so the bitmaps below must apply
+  // the EXIF orientation too (older engines default to ignoring it)
+  const width = probe.naturalWidth;
+  const height = probe.naturalHeight;
+  // Older browsers without createImageBitmap draw the <img> itself
+  if (typeof createImageBitmap !== "function") {
+    return { image: probe, width, height };
+  }
+
+  // createImageBitmap decodes straight from the Blob (off the main thread in
+  // most browsers). Camera photos can be tens of megapixels: have the decoder
+  // produce an already-scaled bitmap instead of a full-resolution one
+  if (width > MAX_IMAGE_WIDTH && width * height > MAX_DECODE_PIXELS) {
+    const image = await createImageBitmap(file, {
+      resizeWidth: MAX_IMAGE_WIDTH,
+      resizeHeight: Math.max(1, Math.round((height * MAX_IMAGE_WIDTH) / width)),
+      resizeQuality: "high",
+      imageOrientation: "from-image",
+    });
+    return { image, width, height };
+  }
+
+  const image = await createImageBitmap(file, { imageOrientation: "from-image" });
+  return { image, width, height };
+}
+
+/**
+ * Encode an image file for embedding in an editor.
+ * Wide images are scaled down to MAX_IMAGE_WIDTH and re-encoded as WebP
+ * (keeps transparency) or JPEG. PNG/BMP at their original width are only
+ * encoded lossily when larger than LOSSY_REENCODE_MIN_BYTES; otherwise PNG is
+ * kept as-is and BMP becomes lossless PNG. Falls back to the original bytes
+ * whenever re-encoding would not help.
+ */
+async function encodeImageFile(file) {
+  if (!REENCODABLE_IMAGE_TYPES.has(file.type)) {
+    return readFileAsDataUrl(file);
+  }
+
+  // Decide from the dimensions (an <img> only needs the header for those)
+  // before paying for a full decode into a bitmap
+  const probe = await loadImageElement(file);
+  const width = probe.naturalWidth;
+  const height = probe.naturalHeight;
+  const needsResize = width > MAX_IMAGE_WIDTH;
+  const isLosslessSource = file.type === "image/png" || file.type === "image/bmp";
+  const lossless =
+    !needsResize && isLosslessSource && file.size <= LOSSY_REENCODE_MIN_BYTES;
+  // At the original width, JPEG/WebP and small PNGs are kept byte-for-byte
+  if (!needsResize && (!isLosslessSource || (lossless && file.type === "image/png"))) {
+    return readFileAsDataUrl(file);
+  }
+
+  const { image: img } = await decodeImageFile(file, probe);
+
+  const scale = needsResize ? MAX_IMAGE_WIDTH / width : 1;
+  const canvas = document.createElement("canvas");
+  canvas.width = Math.round(width * scale);
+  canvas.height = Math.round(height * scale);
+  const ctx = canvas.getContext("2d");
+  ctx.imageSmoothingQuality = "high";
+  ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
+  if (img.close) img.close();
+
+  let dataUrl;
+  if (lossless) {
+    dataUrl = canvas.toDataURL("image/png");
+  } else if (file.type === "image/jpeg") {
+    dataUrl = canvas.toDataURL("image/jpeg", JPEG_QUALITY);
+  } else {
+    dataUrl = canvas.toDataURL("image/webp", WEBP_QUALITY);
+    // Browsers without a WebP encoder silently return PNG
+    if (!dataUrl.startsWith("data:image/webp")) {
+      dataUrl = canvas.toDataURL("image/png");
+    }
   }
+
+  // Base64 inflates by 4/3; keep the original if it was already smaller
+  if (!needsResize && dataUrl.length > (file.size * 4) / 3 + 64) {
+    return readFileAsDataUrl(file);
+  }
+  return dataUrl;
+}
+
+function readImageAsDataUrl(file) {
+  const key = imageFileKey(file);
+  const cached = imageDataUrlCache.get(key);
+  if (cached) {
+    // Re-insert so the Map's insertion order doubles as LRU order
+    imageDataUrlCache.delete(key);
+    imageDataUrlCache.set(key, cached);
+    return Promise.resolve(cached);
+  }
+
+  return encodeImageFile(file).then((dataUrl) => {
+    if (dataUrl) {
+      imageDataUrlCache.set(key, dataUrl);
+      if (imageDataUrlCache.size > IMAGE_DATA_URL_CACHE_LIMIT) {
+        imageDataUrlCache.delete(imageDataUrlCache.keys().next().value);
+      }
+    }
+    return dataUrl;
+  });
 }
 
 // Fixed image insertion: always inserts into the correct editor at cursor position
 function insertImageIntoEditor(editorId, file) {
   const editor = document.getElementById(editorId);
   if (!editor || !file) return;
+  if (file.size > MAX_IMAGE_FILE_BYTES) {
+    alert(`Image is too large (max ${MAX_IMAGE_FILE_BYTES / (1024 * 1024)} MB).`);
+    return;
+  }
 
   // Ensure editor is focused
   editor.focus();
 
-  const reader = new FileReader();
-  reader.onload = (e) => {
-    const dataUrl = e.target.result;
+  readImageAsDataUrl(file).then((dataUrl) => {
     if (!dataUrl) return;
 
     // Create img element for inline display
@@ -387,17 +648,49 @@ function insertImageIntoEditor(editorId, file) {
       editor.appendChild(br);
     }
 
-    // Keep editor focused
-    editor.focus();
-  };
-  reader.onerror = (err) => {
+    // Keep editor focused; skip the call when it never lost focus
+    if (document.activeElement !== editor) {
+      editor.focus();
+    }
+  }).catch((err) => {
     console.error("Failed to read image file:", err);
     alert("Failed to load image file.");
-  };
-  reader.readAsDataURL(file);
+  });
 }
 
 // ==== QUESTIONS ====
+// uniqueid -> question index. Rebuilt lazily when state.questions is
+// replaced; in-place mutations must call invalidateQuestionIndex().
+let questionLookup = { source: null, byId: null };
+
+function invalidateQuestionIndex() {
+  questionLookup = { source: null, byId: null };
+}
+
+// Remove matching questions in a single in-place pass (no new array)
+function removeQuestionsWhere(predicate) {
+  const list = state.questions;
+  let kept = 0;
+  for (let i = 0; i < list.length; i++) {
+    if (!predicate(list[i])) list[kept++] = list[i];
+  }
+  list.length = kept;
+  invalidateQuestionIndex();
+}
+
+function getQuestionById(uniqueid) {
+  if (questionLookup.source !== state.questions) {
+    questionLookup = {
+      source: state.questions,
+      byId: new Map(state.questions.map((q) => [q.uniqueid, q])),
+    };
+  }
+  return questionLookup.byId.get(uniqueid);
+}
+
+// Question paths: a number optionally followed by dotted parts, e.g. 10 or 10.a.i
+const PATH_PATTERN = /^\d+(?:\.[a-z0-9]+)*$/i;
+
 function validateQuestionInput(forUpdate = false) {
   const examInfo = validateExamInfo();
   if (!examInfo) return null;
@@ -409,7 +702,7 @@ function validateQuestionInput(forUpdate = false) {
     return null;
   }
 
-  const set = state.sets.find((s) => s.id === setId);
+  const set = getSetById(setId);
   if (!set) {
     alert("Selected set not found.");
     return null;
@@ -420,23 +713,26 @@ function validateQuestionInput(forUpdate = false) {
   const marks = Number(qMarksEl.value || 0);
   const needsContext = answerType === 1 && !!qNeedsContextEl.checked;
 
-  const textHtml = getEditorHtml(qTextEditorEl);
-  const textPlain = htmlToPlainText(textHtml);
-
-  const markHtml = getEditorHtml(qMarkEditorEl);
-  const markPlain = htmlToPlainText(markHtml);
+  // Check emptiness on the live editors' text; the HTML (which may carry
+  // large base64 images) is only serialized once validation has passed
+  const textPlain = getEditorPlainText(qTextEditorEl);
 
   if (!path) {
     alert("Path is required.");
     return null;
   }
+  if (!PATH_PATTERN.test(path)) {
+    alert('Path must be a number optionally followed by dotted parts (e.g., "10" or "10.a.i").');
+    return null;
+  }
   if (!textPlain) {
     alert("Question text is required.");
     return null;
   }
 
   if (answerType === 1 || answerType === 2) {
-    if (!markPlain) {
+    // Context-only questions never need the mark scheme text
+    if (!getEditorPlainText(qMarkEditorEl)) {
       alert("Mark scheme is required for answer types 1 and 2.");
       return null;
     }
@@ -458,12 +754,13 @@ function validateQuestionInput(forUpdate = false) {
     answerType,
     marks,
     needsContext,
-    textHtml,
-    markHtml,
+    textHtml: getEditorHtml(qTextEditorEl),
+    markHtml: getEditorHtml(qMarkEditorEl),
   };
 }
 
 function addQuestion(resetEditorsAfter = true) {
+  if (isExportBusy()) return;
   // Ensure we're not in edit mode
   if (state.editingQuestionId) {
     alert("Please cancel the current edit or update the question first.");
@@ -496,6 +793,7 @@ function addQuestion(resetEditorsAfter = true) {
   };
 
   state.questions.push(question);
+  invalidateQuestionIndex();
   state.currentSetId = set.id;
   
   // Recalculate orders to ensure they're contiguous
@@ -575,12 +873,13 @@ function clearEditMode() {
 }
 
 function updateQuestion() {
+  if (isExportBusy()) return;
   if (!state.editingQuestionId) {
     alert("No question is being edited.");
     return;
   }
   
-  const question = state.questions.find((q) => q.uniqueid === state.editingQuestionId);
+  const question = getQuestionById(state.editingQuestionId);
   if (!question) {
     alert("Question not found.");
     clearEditMode();
@@ -593,8 +892,6 @@ function updateQuestion() {
     validated;
 
   // Preserve uniqueid - never change it
-  const oldSetId = question.set_id;
-  
   // Update all fields
   question.path = path;
   question.text_body = textHtml;
@@ -606,28 +903,32 @@ function updateQuestion() {
   question.subject = state.exam.subject;
 
   // If moved to a different set, update set info and recalc orders
-  if (question.set_id !== set.id) {
+  // (orders are unaffected when the question stays in its set)
+  const setChanged = question.set_id !== set.id;
+  if (setChanged) {
     question.set_id = set.id;
     question.set_label = set.label;
     question.section = set.section;
     recalcOrders();
-  } else {
-    // Even if set didn't change, recalc to ensure order is correct
-    recalcOrders();
   }
 
   saveStateToStorage();
-  renderPreview();
+  // Same set: only this question's row changed
+  if (setChanged || !replacePreviewRow(question)) {
+    renderPreview();
+  }
   updateStatus("Question updated.");
   clearEditMode();
 }
 
 function deleteQuestion(uniqueid) {
-  const q = state.questions.find((x) => x.uniqueid === uniqueid);
+  if (isExportBusy()) return;
+  const q = getQuestionById(uniqueid);
   if (!q) return;
   const ok = window.confirm("Delete this question?");
   if (!ok) return;
-  state.questions = state.questions.filter((x) => x.uniqueid !== uniqueid);
+  state.questions.splice(state.questions.indexOf(q), 1);
+  invalidateQuestionIndex();
   recalcOrders();
   saveStateToStorage();
   renderPreview();
@@ -635,51 +936,81 @@ function deleteQuestion(uniqueid) {
 }
 
 function moveQuestion(uniqueid, delta) {
-  const question = state.questions.find((q) => q.uniqueid === uniqueid);
+  if (isExportBusy()) return;
+  const question = getQuestionById(uniqueid);
   if (!question) return;
-  const setId = question.set_id;
-  const setQuestions = state.questions
-    .filter((q) => q.set_id === setId)
-    .sort((a, b) => (a.order || 0) - (b.order || 0));
 
-  const idx = setQuestions.findIndex((q) => q.uniqueid === uniqueid);
-  const newIdx = idx + delta;
-  if (newIdx < 0 || newIdx >= setQuestions.length) return;
-
-  const [item] = setQuestions.splice(idx, 1);
-  setQuestions.splice(newIdx, 0, item);
+  // Orders are kept contiguous (1..n) within each set, so the neighbour is
+  // the question one order step away; swapping the two orders is the move
+  const targetOrder = question.order + delta;
+  const neighbour = state.questions.find(
+    (q) => q.set_id === question.set_id && q.order === targetOrder
+  );
+  if (!neighbour) return;
 
-  // Write back order values
-  setQuestions.forEach((q, i) => {
-    q.order = i + 1;
-  });
+  neighbour.order = question.order;
+  question.order = targetOrder;
 
   saveStateToStorage();
-  renderPreview();
+  if (!swapPreviewRows(question, neighbour)) {
+    renderPreview();
+  }
 }
 
-function recalcOrders() {
+// Bucket questions by set id, each bucket sorted by current order
+function groupQuestionsBySet() {
   const bySet = {};
   state.questions.forEach((q) => {
     if (!bySet[q.set_id]) bySet[q.set_id] = [];
     bySet[q.set_id].push(q);
   });
   Object.values(bySet).forEach((arr) => {
-    arr
-      .sort((a, b) => (a.order || 0) - (b.order || 0))
-      .forEach((q, i) => {
-        q.order = i + 1;
-      });
+    arr.sort((a, b) => (a.order || 0) - (b.order || 0));
   });
+  return bySet;
+}
+
+// Renumber orders contiguously within each set; returns the sorted buckets
+function recalcOrders() {
+  const bySet = groupQuestionsBySet();
+  Object.values(bySet).forEach((arr) => {
+    arr.forEach((q, i) => {
+      q.order = i + 1;
+    });
+  });
+  return bySet;
 }
 
 // ==== PREVIEW RENDERING WITH DRAG/DROP ====
+// Header row shared by every set's table; parsed once and cloned per render
+const previewTheadTemplate = document.createElement("thead");
+previewTheadTemplate.innerHTML =
+  "<tr><th>#</th><th>Path</th><th>Type</th><th>Question</th><th>Mark scheme</th><th>Marks</th><th></th></tr>";
+
+// question -> preview strings, reused by every render until its HTML changes
+const previewCache = new WeakMap();
+
+function getQuestionPreviews(q) {
+  const textHtml = q.text_body || "";
+  const markHtml = q.mark_scheme || "";
+  let entry = previewCache.get(q);
+  if (!entry || entry.textHtml !== textHtml || entry.markHtml !== markHtml) {
+    entry = {
+      textHtml,
+      markHtml,
+      text: htmlPreview(textHtml, 80) || "(empty)",
+      mark: htmlPreview(markHtml, 60) || "(none)",
+    };
+    previewCache.set(q, entry);
+  }
+  return entry;
+}
+
 let dragState = { questionId: null };
 
 function renderPreview() {
-  previewContainerEl.innerHTML = "";
-
   if (!state.sets.length || !state.questions.length) {
+    previewContainerEl.replaceChildren();
     previewEmptyEl.style.display = "block";
     exportExcelBtn.disabled = true;
     clearAllBtn.disabled = true;
@@ -687,23 +1018,20 @@ function renderPreview() {
   }
 
   previewEmptyEl.style.display = "none";
-  exportExcelBtn.disabled = false;
-  clearAllBtn.disabled = false;
+  exportExcelBtn.disabled = exportInProgress;
+  clearAllBtn.disabled = exportInProgress;
 
-  const bySet = {};
-  state.questions.forEach((q) => {
-    if (!bySet[q.set_id]) bySet[q.set_id] = [];
-    bySet[q.set_id].push(q);
-  });
+  const bySet = groupQuestionsBySet();
 
   const setsSorted = [...state.sets].sort((a, b) =>
     a.label.localeCompare(b.label)
   );
 
+  // Build every group off-document and swap them in with a single DOM write
+  const fragment = document.createDocumentFragment();
+
   setsSorted.forEach((set) => {
-    const questions = (bySet[set.id] || []).sort(
-      (a, b) => (a.order || 0) - (b.order || 0)
-    );
+    const questions = bySet[set.id] || [];
     if (!questions.length) return;
 
     const groupEl = document.createElement("div");
@@ -731,130 +1059,11 @@ function renderPreview() {
 
     const table = document.createElement("table");
     table.className = "questions-table-sm";
-    const thead = document.createElement("thead");
-    thead.innerHTML =
-      "<tr><th>#</th><th>Path</th><th>Type</th><th>Question</th><th>Mark scheme</th><th>Marks</th><th></th></tr>";
-    table.appendChild(thead);
+    table.appendChild(previewTheadTemplate.cloneNode(true));
 
     const tbody = document.createElement("tbody");
     questions.forEach((q) => {
-      const tr = document.createElement("tr");
-      tr.dataset.qid = q.uniqueid;
-      tr.draggable = true;
-
-      const orderTd = document.createElement("td");
-      orderTd.textContent = String(q.order || "");
-
-      const pathTd = document.createElement("td");
-      pathTd.textContent = q.path;
-
-      const typeTd = document.createElement("td");
-      typeTd.textContent = formatAnswerTypeLabel(q.answer_type);
-
-      const textTd = document.createElement("td");
-      const textPreview = htmlToPlainText(q.text_body || "");
-      textTd.textContent =
-        textPreview.length > 80
-          ? textPreview.slice(0, 80) + "…"
-          : textPreview || "(empty)";
-
-      const markTd = document.createElement("td");
-      const markPreview = htmlToPlainText(q.mark_scheme || "");
-      markTd.textContent =
-        markPreview.length > 60
-          ? markPreview.slice(0, 60) + "…"
-          : markPreview || "(none)";
-
-      const marksTd = document.createElement("td");
-      marksTd.textContent = q.marks ?? "";
-
-      const actionsTd = document.createElement("td");
-      actionsTd.className = "actions-cell";
-
-      const dragSpan = document.createElement("span");
-      dragSpan.className = "drag-handle";
-      dragSpan.textContent = "↕";
-
-      const upBtn = document.createElement("button");
-      upBtn.className = "btn tiny";
-      upBtn.textContent = "↑";
-      upBtn.addEventListener("click", (e) => {
-        e.preventDefault();
-        e.stopPropagation();
-        moveQuestion(q.uniqueid, -1);
-      });
-
-      const downBtn = document.createElement("button");
-      downBtn.className = "btn tiny";
-      downBtn.textContent = "↓";
-      downBtn.addEventListener("click", (e) => {
-        e.preventDefault();
-        e.stopPropagation();
-        moveQuestion(q.uniqueid, 1);
-      });
-
-      const editBtn = document.createElement("button");
-      editBtn.className = "btn tiny";
-      editBtn.textContent = "Edit";
-      editBtn.addEventListener("click", (e) => {
-        e.preventDefault();
-        e.stopPropagation();
-        loadQuestionIntoForm(q);
-      });
-
-      const copyBtn = document.createElement("button");
-      copyBtn.className = "btn tiny";
-      copyBtn.textContent = "Copy";
-      copyBtn.addEventListener("click", (e) => {
-        e.preventDefault();
-        e.stopPropagation();
-        copyQuestionIntoForm(q);
-      });
-
-      const delBtn = document.createElement("button");
-      delBtn.className = "btn tiny danger";
-      delBtn.textContent = "Delete";
-      delBtn.addEventListener("click", (e) => {
-        e.preventDefault();
-        e.stopPropagation();
-        deleteQuestion(q.uniqueid);
-      });
-
-      actionsTd.appendChild(dragSpan);
-      actionsTd.appendChild(upBtn);
-      actionsTd.appendChild(downBtn);
-      actionsTd.appendChild(editBtn);
-      actionsTd.appendChild(copyBtn);
-      actionsTd.appendChild(delBtn);
-
-      tr.appendChild(orderTd);
-      tr.appendChild(pathTd);
-      tr.appendChild(typeTd);
-      tr.appendChild(textTd);
-      tr.appendChild(markTd);
-      tr.appendChild(marksTd);
-      tr.appendChild(actionsTd);
-
-      // Drag events
-      tr.addEventListener("dragstart", (e) => {
-        dragState.questionId = q.uniqueid;
-        tr.classList.add("dragging");
-        e.dataTransfer.effectAllowed = "move";
-      });
-      tr.addEventListener("dragend", () => {
-        tr.classList.remove("dragging");
-        dragState.questionId = null;
-      });
-      tr.addEventListener("dragover", (e) => {
-        e.preventDefault();
-      });
-      tr.addEventListener("drop", (e) => {
-        e.preventDefault();
-        if (!dragState.questionId || dragState.questionId === q.uniqueid) return;
-        handleDropOnQuestion(set.id, q.uniqueid);
-      });
-
-      tbody.appendChild(tr);
+      tbody.appendChild(buildPreviewRow(q));
     });
 
     table.appendChild(tbody);
@@ -869,16 +1078,161 @@ function renderPreview() {
       toggleSpan.textContent = expanded ? "▼" : "►";
     });
 
-    previewContainerEl.appendChild(groupEl);
+    fragment.appendChild(groupEl);
+  });
+
+  previewContainerEl.replaceChildren(fragment);
+}
+
+function buildPreviewRow(q) {
+  const tr = document.createElement("tr");
+  tr.dataset.qid = q.uniqueid;
+  tr.draggable = true;
+
+  const orderTd = document.createElement("td");
+  orderTd.textContent = String(q.order || "");
+
+  const pathTd = document.createElement("td");
+  pathTd.textContent = q.path;
+
+  const typeTd = document.createElement("td");
+  typeTd.textContent = formatAnswerTypeLabel(q.answer_type);
+
+  const previews = getQuestionPreviews(q);
+
+  const textTd = document.createElement("td");
+  textTd.textContent = previews.text;
+
+  const markTd = document.createElement("td");
+  markTd.textContent = previews.mark;
+
+  const marksTd = document.createElement("td");
+  marksTd.textContent = q.marks ?? "";
+
+  const actionsTd = document.createElement("td");
+  actionsTd.className = "actions-cell";
+
+  const dragSpan = document.createElement("span");
+  dragSpan.className = "drag-handle";
+  dragSpan.textContent = "↕";
+  actionsTd.appendChild(dragSpan);
+
+  // Clicks and drags are handled by delegated listeners on the container
+  ROW_ACTIONS.forEach(([action, label, className]) => {
+    const btn = document.createElement("button");
+    btn.className = className;
+    btn.textContent = label;
+    btn.dataset.action = action;
+    actionsTd.appendChild(btn);
+  });
+
+  tr.appendChild(orderTd);
+  tr.appendChild(pathTd);
+  tr.appendChild(typeTd);
+  tr.appendChild(textTd);
+  tr.appendChild(markTd);
+  tr.appendChild(marksTd);
+  tr.appendChild(actionsTd);
+
+  return tr;
+}
+
+// ---- In-place preview updates (avoid a full re-render for single rows) ----
+function findPreviewRow(uniqueid) {
+  return previewContainerEl.querySelector(`tr[data-qid="${CSS.escape(uniqueid)}"]`);
+}
+
+// Replace one question's row; returns false if the row isn't rendered
+function replacePreviewRow(q) {
+  const row = findPreviewRow(q.uniqueid);
+  if (!row) return false;
+  row.replaceWith(buildPreviewRow(q));
+  return true;
+}
+
+// Reflect an order swap between two adjacent questions of the same set
+function swapPreviewRows(a, b) {
+  const rowA = findPreviewRow(a.uniqueid);
+  const rowB = findPreviewRow(b.uniqueid);
+  if (!rowA || !rowB || rowA.parentNode !== rowB.parentNode) return false;
+  rowA.cells[0].textContent = String(a.order || "");
+  rowB.cells[0].textContent = String(b.order || "");
+  const [first, second] = a.order < b.order ? [rowA, rowB] : [rowB, rowA];
+  second.parentNode.insertBefore(first, second);
+  return true;
+}
+
+// [data-action, label, className] for each preview row button
+const ROW_ACTIONS = [
+  ["up", "↑", "btn tiny"],
+  ["down", "↓", "btn tiny"],
+  ["edit", "Edit", "btn tiny"],
+  ["copy", "Copy", "btn tiny"],
+  ["delete", "Delete", "btn tiny danger"],
+];
+
+function handlePreviewClick(e) {
+  const btn = e.target.closest("button[data-action]");
+  const tr = btn && btn.closest("tr[data-qid]");
+  if (!tr) return;
+  e.preventDefault();
+  e.stopPropagation();
+
+  const qid = tr.dataset.qid;
+  const action = btn.dataset.action;
+  if (action === "up") {
+    moveQuestion(qid, -1);
+  } else if (action === "down") {
+    moveQuestion(qid, 1);
+  } else if (action === "delete") {
+    deleteQuestion(qid);
+  } else {
+    const q = getQuestionById(qid);
+    if (!q) return;
+    if (action === "edit") loadQuestionIntoForm(q);
+    else if (action === "copy") copyQuestionIntoForm(q);
+  }
+}
+
+function initPreviewEvents() {
+  previewContainerEl.addEventListener("click", handlePreviewClick);
+
+  // Drag events
+  previewContainerEl.addEventListener("dragstart", (e) => {
+    const tr = e.target.closest("tr[data-qid]");
+    if (!tr) return;
+    dragState.questionId = tr.dataset.qid;
+    tr.classList.add("dragging");
+    e.dataTransfer.effectAllowed = "move";
+  });
+  previewContainerEl.addEventListener("dragend", (e) => {
+    const tr = e.target.closest("tr[data-qid]");
+    if (tr) tr.classList.remove("dragging");
+    dragState.questionId = null;
+  });
+  previewContainerEl.addEventListener("dragover", (e) => {
+    if (e.target.closest("tr[data-qid]")) e.preventDefault();
+  });
+  previewContainerEl.addEventListener("drop", (e) => {
+    const tr = e.target.closest("tr[data-qid]");
+    if (!tr) return;
+    e.preventDefault();
+    const targetId = tr.dataset.qid;
+    if (!dragState.questionId || dragState.questionId === targetId) return;
+    const groupEl = tr.closest(".set-group");
+    if (!groupEl) return;
+    handleDropOnQuestion(groupEl.dataset.setId, targetId);
   });
 }
 
 function handleDropOnQuestion(targetSetId, targetQuestionId) {
-  const dragged = state.questions.find((q) => q.uniqueid === dragState.questionId);
-  const target = state.questions.find((q) => q.uniqueid === targetQuestionId);
+  if (isExportBusy()) return;
+  const dragged = getQuestionById(dragState.questionId);
+  const target = getQuestionById(targetQuestionId);
   if (!dragged || !target) return;
 
   // Move dragged question into target set and position just before target
+  const sourceSetId = dragged.set_id;
   dragged.set_id = targetSetId;
   const setQuestions = state.questions.filter((q) => q.set_id === targetSetId);
   setQuestions.sort((a, b) => (a.order || 0) - (b.order || 0));
@@ -891,9 +1245,13 @@ function handleDropOnQuestion(targetSetId, targetQuestionId) {
   withoutDragged.forEach((q, i) => {
     q.order = i + 1;
   });
+  // Close the gap left in the set the question came from
+  if (sourceSetId !== targetSetId) {
+    recalcOrders();
+  }
 
   // Update set metadata
-  const set = state.sets.find((s) => s.id === targetSetId);
+  const set = getSetById(targetSetId);
   if (set) {
     dragged.set_label = set.label;
     dragged.section = set.section;
@@ -905,6 +1263,114 @@ function handleDropOnQuestion(targetSetId, targetQuestionId) {
 
 // ==== TEXT NORMALIZATION FOR CSV EXPORT ====
 
+// Comprehensive character encoding fixes for ALL common mojibake patterns
+// (module-level so the regex literals are created once, not per call)
+const ENCODING_FIXES = [
+  // Apostrophes and single quotes (UTF-8 mis-encoded as Windows-1252 or ISO-8859-1)
+  [/‚Äô/g, "'"],           // UTF-8: U+2019 (right single quotation mark) mis-encoded
+  [/â€™/g, "'"],           // UTF-8: U+2019 mis-encoded (common)
+  [/â€˜/g, "'"],           // UTF-8: U+2018 (left single quotation mark) mis-encoded
+  [/â€™/g, "'"],           // UTF-8: U+2019 mis-encoded
+  [/'/g, "'"],             // Straight apostrophe (preserve as-is)
+  [/''/g, "'"],            // Double apostrophe -> single
+  [/`/g, "'"],             // Backtick -> apostrophe
+  [/´/g, "'"],             // Acute accent -> apostrophe
+  
+  // Double quotes (UTF-8 mis-encoded)
+  [/‚Äú/g, '"'],           // UTF-8: U+201C (left double quotation mark) mis-encoded
+  [/‚Äù/g, '"'],           // UTF-8: U+201D (right double quotation mark) mis-encoded
+  [/â€œ/g, '"'],           // UTF-8: U+201C mis-encoded
+  [/â€/g, '"'],            // UTF-8: U+201D mis-encoded
+  [/â€"/g, '"'],           // Another quote variant
+  [/â€"/g, '"'],           // Another quote variant
+  [/"/g, '"'],             // Straight double quote (preserve as-is, will be escaped in CSV)
+  
+  // Mathematical symbols
+  [/‚â†/g, "≠"],           // Not equal symbol mis-encoded
+  [/‚â†'/g, "≠"],          // Not equal variant
+  [/â‰ /g, "≠"],           // UTF-8: U+2260 (not equal to) mis-encoded
+  [/â‰ /g, "≠"],           // Another not equal variant
+  [/â‰¥/g, "≥"],           // UTF-8: U+2265 (greater-than or equal to)
+  [/â‰¤/g, "≤"],           // UTF-8: U+2264 (less-than or equal to)
+  [/â‰/g, "≈"],            // UTF-8: U+2248 (almost equal to)
+  
+  // Dashes and hyphens
+  [/â€"/g, "—"],           // UTF-8: U+2014 (em dash) mis-encoded
+  [/â€"/g, "–"],           // UTF-8: U+2013 (en dash) mis-encoded
+  [/â€"/g, "—"],           // Em dash variant
+  [/â€"/g, "–"],           // En dash variant
+  [/—/g, "—"],             // Em dash (preserve if already correct)
+  [/–/g, "–"],             // En dash (preserve if already correct)
+  [/-/g, "-"],             // Regular hyphen (preserve)
+  
+  // Bullets and list markers
+  [/‚Ä¢/g, "•"],           // UTF-8: U+2022 (bullet) mis-encoded
+  [/â€¢/g, "•"],           // Bullet variant
+  [/â—/g, "•"],            // Bullet variant
+  [/•/g, "•"],             // Bullet (preserve if correct)
+  
+  // Ellipsis
+  [/â€¦/g, "…"],           // UTF-8: U+2026 (horizontal ellipsis) mis-encoded
+  [/.../g, "…"],           // Three dots -> ellipsis (optional)
+  
+  // Currency symbols
+  [/â‚¬/g, "€"],            // UTF-8: U+20AC (euro sign) mis-encoded
+  [/Â£/g, "£"],             // UTF-8: U+00A3 (pound sign) mis-encoded
+  [/Â¥/g, "¥"],             // UTF-8: U+00A5 (yen sign) mis-encoded
+  [/Â¢/g, "¢"],             // UTF-8: U+00A2 (cent sign) mis-encoded
+  
+  // Common accented characters (Latin-1/Windows-1252 mis-encoding)
+  [/Ã¡/g, "á"],             // UTF-8: U+00E1 (a with acute)
+  [/Ã©/g, "é"],             // UTF-8: U+00E9 (e with acute)
+  [/Ã­/g, "í"],             // UTF-8: U+00ED (i with acute)
+  [/Ã³/g, "ó"],             // UTF-8: U+00F3 (o with acute)
+  [/Ãº/g, "ú"],             // UTF-8: U+00FA (u with acute)
+  [/Ã±/g, "ñ"],             // UTF-8: U+00F1 (n with tilde)
+  [/Ã¡/g, "á"],             // a with acute
+  [/Ã©/g, "é"],             // e with acute
+  [/Ã­/g, "í"],             // i with acute
+  [/Ã³/g, "ó"],             // o with acute
+  [/Ãº/g, "ú"],             // u with acute
+  [/Ã/g, "à"],              // a with grave
+  [/Ã¨/g, "è"],             // e with grave
+  [/Ã¬/g, "ì"],             // i with grave
+  [/Ã²/g, "ò"],             // o with grave
+  [/Ã¹/g, "ù"],             // u with grave
+  [/Ã£/g, "ã"],             // a with tilde
+  [/Ãµ/g, "õ"],             // o with tilde
+  [/Ã§/g, "ç"],             // c with cedilla
+  [/Ã¼/g, "ü"],             // u with diaeresis
+  [/Ã¶/g, "ö"],             // o with diaeresis
+  [/Ã¤/g, "ä"],             // a with diaeresis
+  [/Ã«/g, "ë"],             // e with diaeresis
+  [/Ã¯/g, "ï"],             // i with diaeresis
+  [/Ã¿/g, "ÿ"],             // y with diaeresis
+  
+  // Uppercase accented characters
+  [/Ã/g, "Á"],              // A with acute
+  [/Ã‰/g, "É"],             // E with acute
+  [/Ã/g, "Í"],              // I with acute
+  [/Ã"/g, "Ó"],             // O with acute
+  [/Ãš/g, "Ú"],             // U with acute
+  [/Ã'/g, "Ñ"],             // N with tilde
+  
+  // Other common symbols
+  [/Â°/g, "°"],             // UTF-8: U+00B0 (degree sign)
+  [/Â©/g, "©"],             // UTF-8: U+00A9 (copyright sign)
+  [/Â®/g, "®"],             // UTF-8: U+00AE (registered sign)
+  [/Â§/g, "§"],             // UTF-8: U+00A7 (section sign)
+  [/Â¶/g, "¶"],             // UTF-8: U+00B6 (pilcrow sign)
+  [/Â±/g, "±"],             // UTF-8: U+00B1 (plus-minus sign)
+  [/Â²/g, "²"],             // UTF-8: U+00B2 (superscript two)
+  [/Â³/g, "³"],             // UTF-8: U+00B3 (superscript three)
+  [/Â¼/g, "¼"],             // UTF-8: U+00BC (vulgar fraction one quarter)
+  [/Â½/g, "½"],             // UTF-8: U+00BD (vulgar fraction one half)
+  [/Â¾/g, "¾"],             // UTF-8: U+00BE (vulgar fraction three quarters)
+  
+  // Remove null bytes and other control characters (except newlines/tabs)
+  [/[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]/g, ""], // Remove control chars except \n, \r, \t
+];
+
 /**
  * Comprehensive character encoding normalization - fixes ALL common encoding issues
  * Converts corrupted/mojibake characters back to their proper Unicode equivalents
@@ -912,115 +1378,8 @@ function handleDropOnQuestion(targetSetId, targetQuestionId) {
 function normalizeCharacterEncoding(text) {
   if (!text) return text;
   
-  // Comprehensive character encoding fixes for ALL common mojibake patterns
-  const encodingFixes = [
-    // Apostrophes and single quotes (UTF-8 mis-encoded as Windows-1252 or ISO-8859-1)
-    [/‚Äô/g, "'"],           // UTF-8: U+2019 (right single quotation mark) mis-encoded
-    [/â€™/g, "'"],           // UTF-8: U+2019 mis-encoded (common)
-    [/â€˜/g, "'"],           // UTF-8: U+2018 (left single quotation mark) mis-encoded
-    [/â€™/g, "'"],           // UTF-8: U+2019 mis-encoded
-    [/'/g, "'"],             // Straight apostrophe (preserve as-is)
-    [/''/g, "'"],            // Double apostrophe -> single
-    [/`/g, "'"],             // Backtick -> apostrophe
-    [/´/g, "'"],             // Acute accent -> apostrophe
-    
-    // Double quotes (UTF-8 mis-encoded)
-    [/‚Äú/g, '"'],           // UTF-8: U+201C (left double quotation mark) mis-encoded
-    [/‚Äù/g, '"'],           // UTF-8: U+201D (right double quotation mark) mis-encoded
-    [/â€œ/g, '"'],           // UTF-8: U+201C mis-encoded
-    [/â€/g, '"'],            // UTF-8: U+201D mis-encoded
-    [/â€"/g, '"'],           // Another quote variant
-    [/â€"/g, '"'],           // Another quote variant
-    [/"/g, '"'],             // Straight double quote (preserve as-is, will be escaped in CSV)
-    
-    // Mathematical symbols
-    [/‚â†/g, "≠"],           // Not equal symbol mis-encoded
-    [/‚â†'/g, "≠"],          // Not equal variant
-    [/â‰ /g, "≠"],           // UTF-8: U+2260 (not equal to) mis-encoded
-    [/â‰ /g, "≠"],           // Another not equal variant
-    [/â‰¥/g, "≥"],           // UTF-8: U+2265 (greater-than or equal to)
-    [/â‰¤/g, "≤"],           // UTF-8: U+2264 (less-than or equal to)
-    [/â‰/g, "≈"],            // UTF-8: U+2248 (almost equal to)
-    
-    // Dashes and hyphens
-    [/â€"/g, "—"],           // UTF-8: U+2014 (em dash) mis-encoded
-    [/â€"/g, "–"],           // UTF-8: U+2013 (en dash) mis-encoded
-    [/â€"/g, "—"],           // Em dash variant
-    [/â€"/g, "–"],           // En dash variant
-    [/—/g, "—"],             // Em dash (preserve if already correct)
-    [/–/g, "–"],             // En dash (preserve if already correct)
-    [/-/g, "-"],             // Regular hyphen (preserve)
-    
-    // Bullets and list markers
-    [/‚Ä¢/g, "•"],           // UTF-8: U+2022 (bullet) mis-encoded
-    [/â€¢/g, "•"],           // Bullet variant
-    [/â—/g, "•"],            // Bullet variant
-    [/•/g, "•"],             // Bullet (preserve if correct)
-    
-    // Ellipsis
-    [/â€¦/g, "…"],           // UTF-8: U+2026 (horizontal ellipsis) mis-encoded
-    [/.../g, "…"],           // Three dots -> ellipsis (optional)
-    
-    // Currency symbols
-    [/â‚¬/g, "€"],            // UTF-8: U+20AC (euro sign) mis-encoded
-    [/Â£/g, "£"],             // UTF-8: U+00A3 (pound sign) mis-encoded
-    [/Â¥/g, "¥"],             // UTF-8: U+00A5 (yen sign) mis-encoded
-    [/Â¢/g, "¢"],             // UTF-8: U+00A2 (cent sign) mis-encoded
-    
-    // Common accented characters (Latin-1/Windows-1252 mis-encoding)
-    [/Ã¡/g, "á"],             // UTF-8: U+00E1 (a with acute)
-    [/Ã©/g, "é"],             // UTF-8: U+00E9 (e with acute)
-    [/Ã­/g, "í"],             // UTF-8: U+00ED (i with acute)
-    [/Ã³/g, "ó"],             // UTF-8: U+00F3 (o with acute)
-    [/Ãº/g, "ú"],             // UTF-8: U+00FA (u with acute)
-    [/Ã±/g, "ñ"],             // UTF-8: U+00F1 (n with tilde)
-    [/Ã¡/g, "á"],             // a with acute
-    [/Ã©/g, "é"],             // e with acute
-    [/Ã­/g, "í"],             // i with acute
-    [/Ã³/g, "ó"],             // o with acute
-    [/Ãº/g, "ú"],             // u with acute
-    [/Ã/g, "à"],              // a with grave
-    [/Ã¨/g, "è"],             // e with grave
-    [/Ã¬/g, "ì"],             // i with grave
-    [/Ã²/g, "ò"],             // o with grave
-    [/Ã¹/g, "ù"],             // u with grave
-    [/Ã£/g, "ã"],             // a with tilde
-    [/Ãµ/g, "õ"],             // o with tilde
-    [/Ã§/g, "ç"],             // c with cedilla
-    [/Ã¼/g, "ü"],             // u with diaeresis
-    [/Ã¶/g, "ö"],             // o with diaeresis
-    [/Ã¤/g, "ä"],             // a with diaeresis
-    [/Ã«/g, "ë"],             // e with diaeresis
-    [/Ã¯/g, "ï"],             // i with diaeresis
-    [/Ã¿/g, "ÿ"],             // y with diaeresis
-    
-    // Uppercase accented characters
-    [/Ã/g, "Á"],              // A with acute
-    [/Ã‰/g, "É"],             // E with acute
-    [/Ã/g, "Í"],              // I with acute
-    [/Ã"/g, "Ó"],             // O with acute
-    [/Ãš/g, "Ú"],             // U with acute
-    [/Ã'/g, "Ñ"],             // N with tilde
-    
-    // Other common symbols
-    [/Â°/g, "°"],             // UTF-8: U+00B0 (degree sign)
-    [/Â©/g, "©"],             // UTF-8: U+00A9 (copyright sign)
-    [/Â®/g, "®"],             // UTF-8: U+00AE (registered sign)
-    [/Â§/g, "§"],             // UTF-8: U+00A7 (section sign)
-    [/Â¶/g, "¶"],             // UTF-8: U+00B6 (pilcrow sign)
-    [/Â±/g, "±"],             // UTF-8: U+00B1 (plus-minus sign)
-    [/Â²/g, "²"],             // UTF-8: U+00B2 (superscript two)
-    [/Â³/g, "³"],             // UTF-8: U+00B3 (superscript three)
-    [/Â¼/g, "¼"],             // UTF-8: U+00BC (vulgar fraction one quarter)
-    [/Â½/g, "½"],             // UTF-8: U+00BD (vulgar fraction one half)
-    [/Â¾/g, "¾"],             // UTF-8: U+00BE (vulgar fraction three quarters)
-    
-    // Remove null bytes and other control characters (except newlines/tabs)
-    [/[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F]/g, ""], // Remove control chars except \n, \r, \t
-  ];
-  
   let normalized = text;
-  encodingFixes.forEach(([pattern, replacement]) => {
+  ENCODING_FIXES.forEach(([pattern, replacement]) => {
     normalized = normalized.replace(pattern, replacement);
   });
   
@@ -1045,8 +1404,7 @@ function normalizeTextSpacing(html) {
   normalized = normalized.replace(/algorithm's/g, "algorithm's"); // Ensure proper apostrophe
   
   // Now work with DOM for more complex fixes
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = normalized;
+  const tempDiv = parseHtmlFragment(normalized);
   
   // Walk through text nodes and ensure final periods
   function walkTextNodes(node) {
@@ -1122,8 +1480,7 @@ function normalizeQuotes(html) {
 function normalizeMarkSchemeFormat(html) {
   if (!html) return html;
   
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
+  const tempDiv = parseHtmlFragment(html);
   
   // Find all divs and paragraphs that might contain multiple criteria
   const blocks = Array.from(tempDiv.querySelectorAll("div, p"));
@@ -1186,8 +1543,7 @@ function normalizeMarkSchemeFormat(html) {
 function fixBrokenLogicalLines(html) {
   if (!html) return html;
   
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
+  const tempDiv = parseHtmlFragment(html);
   
   // First pass: fix spacing in conditions within text
   function fixConditionSpacing(node) {
@@ -1256,8 +1612,7 @@ function fixBrokenLogicalLines(html) {
 function removeBoldFromQuestionText(html) {
   if (!html) return html;
   
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
+  const tempDiv = parseHtmlFragment(html);
   
   // Remove all <b> and <strong> tags, keeping their text content
   const boldElements = tempDiv.querySelectorAll("b, strong");
@@ -1308,9 +1663,6 @@ function removeBoldFromQuestionText(html) {
 function decodeHtmlEntities(html) {
   if (!html) return html;
   
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
-  
   // Replace &nbsp; with regular spaces
   let decoded = html;
   decoded = decoded.replace(/&nbsp;/g, " ");
@@ -1332,8 +1684,7 @@ function decodeHtmlEntities(html) {
 function removeHardLineBreaks(html) {
   if (!html) return html;
   
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
+  const tempDiv = parseHtmlFragment(html);
   
   // Convert all <br> tags to spaces (for question text, we want continuous text)
   const brElements = tempDiv.querySelectorAll("br");
@@ -1396,6 +1747,13 @@ function removeHardLineBreaks(html) {
   return htmlStr;
 }
 
+// Known section headers that shouldn't have trailing periods, each matched
+// with a following period (possibly before a closing tag). Compiled once.
+const KNOWN_HEADER_PATTERNS = [
+  "Impact of the Second World War on South-East Asia",
+  "Cold War conflicts in Asia"
+].map(header => new RegExp(`(${header.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')})\\.(</[^>]+>|$)`, 'gi'));
+
 /**
  * Remove trailing periods from section headers/titles
  */
@@ -1405,16 +1763,8 @@ function removeTrailingPunctuation(html) {
   // Remove trailing periods from specific known section headers
   let cleaned = html;
   
-  // Known section headers that shouldn't have trailing periods
-  const knownHeaders = [
-    "Impact of the Second World War on South-East Asia",
-    "Cold War conflicts in Asia"
-  ];
-  
   // Check if the HTML contains any of these headers with trailing periods
-  knownHeaders.forEach(header => {
-    // Match the header followed by a period (possibly with HTML tags)
-    const pattern = new RegExp(`(${header.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')})\\.(</[^>]+>|$)`, 'gi');
+  KNOWN_HEADER_PATTERNS.forEach(pattern => {
     cleaned = cleaned.replace(pattern, (match, headerText, tag) => {
       return headerText + tag;
     });
@@ -1439,36 +1789,33 @@ function removeTrailingPunctuation(html) {
 function htmlToPlainTextWithImages(html) {
   if (!html) return "";
   
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
+  const tempDiv = parseHtmlFragment(html);
   
-  // Remove all HTML tags except img
+  // Remove all HTML tags except img; pieces are collected in document order
+  // and joined once rather than concatenated at every level of recursion
+  const parts = [];
   function processNode(node) {
     if (node.nodeType === Node.TEXT_NODE) {
-      return node.textContent;
+      parts.push(node.textContent);
     } else if (node.nodeType === Node.ELEMENT_NODE) {
       if (node.tagName === "IMG") {
         // Keep img tag as-is for later processing
-        return node.outerHTML;
+        parts.push(node.outerHTML);
       } else {
         // Recursively process children
-        let result = "";
-        Array.from(node.childNodes).forEach(child => {
-          result += processNode(child);
-        });
-        return result;
+        for (let child = node.firstChild; child; child = child.nextSibling) {
+          processNode(child);
+        }
       }
     }
-    return "";
   }
   
-  let result = "";
-  Array.from(tempDiv.childNodes).forEach(node => {
-    result += processNode(node);
-  });
+  for (let node = tempDiv.firstChild; node; node = node.nextSibling) {
+    processNode(node);
+  }
   
   // Clean up whitespace (preserve single spaces)
-  result = result.replace(/\s+/g, " ").trim();
+  const result = parts.join("").replace(/\s+/g, " ").trim();
   
   return result;
 }
@@ -1518,7 +1865,52 @@ function normalizeHtmlForExport(html, isMarkScheme = false, isQuestionText = fal
 }
 
 // ==== CSV EXPORT WITH HTML + IMAGE PLACEHOLDERS ====
+// CSV headers (no set_label column)
+const CSV_HEADERS = [
+  "uniqueid",
+  "path",
+  "text_body",
+  "answer_type",
+  "mark_scheme",
+  "needs_context",
+  "exam",
+  "subject",
+  "section",
+  "topic",
+  "order",
+  "marks",
+];
+
+// Number of questions processed between yields back to the event loop
+const EXPORT_YIELD_EVERY = 20;
+
+// Serialize one CSV row (quote all fields, preserve HTML)
+function toCsvLine(values) {
+  return values
+    .map((value) => {
+      const str = value == null ? "" : String(value);
+      // Most fields contain no quotes; skip the regex replace for them
+      const escaped = str.includes('"') ? str.replace(/"/g, '""') : str;
+      return `"${escaped}"`;
+    })
+    .join(",");
+}
+
+const CSV_HEADER_LINE = toCsvLine(CSV_HEADERS);
+
+// Refuse edits while an export is building the CSV from the current state
+function isExportBusy() {
+  if (!exportInProgress) return false;
+  alert("Please wait for the export to finish.");
+  return true;
+}
+
+function yieldToBrowser() {
+  return new Promise((resolve) => setTimeout(resolve, 0));
+}
+
 async function handleExportExcel() {
+  if (exportInProgress) return;
   const examInfo = validateExamInfo();
   if (!examInfo) return;
   if (!state.questions.length) {
@@ -1531,67 +1923,55 @@ async function handleExportExcel() {
     return;
   }
 
+  exportInProgress = true;
   exportExcelBtn.disabled = true;
+  clearAllBtn.disabled = true;
   updateStatus("Generating Excel file...");
 
   try {
     const zip = new JSZip();
 
-    // Recalculate orders
-    recalcOrders();
+    // Recalculate orders; the sorted per-set buckets are reused below
+    const bySet = recalcOrders();
 
-    // CSV headers (no set_label column)
-    const headers = [
-      "uniqueid",
-      "path",
-      "text_body",
-      "answer_type",
-      "mark_scheme",
-      "needs_context",
-      "exam",
-      "subject",
-      "section",
-      "topic",
-      "order",
-      "marks",
-    ];
-
-    // Group by set and sort
-    const bySet = {};
-    state.questions.forEach((q) => {
-      if (!bySet[q.set_id]) bySet[q.set_id] = [];
-      bySet[q.set_id].push(q);
-    });
     // Sort sets numerically by section number, then by label if no section
-    const setsSorted = [...state.sets].sort((a, b) => {
-      // Extract numeric section from section field or label
-      const getSectionNum = (set) => {
-        if (set.section) {
-          const match = String(set.section).match(/(\d+)/);
-          if (match) return parseInt(match[1], 10);
-        }
-        // Try to extract number from label (e.g., "Section 2", "2", "Question 10")
-        const labelMatch = String(set.label).match(/(\d+)/);
-        if (labelMatch) return parseInt(labelMatch[1], 10);
-        return 999; // Put non-numeric sections at end
-      };
-      const aNum = getSectionNum(a);
-      const bNum = getSectionNum(b);
-      if (aNum !== bNum) return aNum - bNum;
-      // Fallback to label comparison if section numbers are equal
-      return a.label.localeCompare(b.label);
-    });
-
-    const rows = [];
-    rows.push(headers);
+    // (sort keys are extracted once per set, not on every comparison)
+    const getSectionNum = (set) => {
+      if (set.section) {
+        const match = String(set.section).match(/(\d+)/);
+        if (match) return parseInt(match[1], 10);
+      }
+      // Try to extract number from label (e.g., "Section 2", "2", "Question 10")
+      const labelMatch = String(set.label).match(/(\d+)/);
+      if (labelMatch) return parseInt(labelMatch[1], 10);
+      return 999; // Put non-numeric sections at end
+    };
+    const setsSorted = state.sets
+      .map((set) => ({ set, num: getSectionNum(set) }))
+      .sort((a, b) => {
+        if (a.num !== b.num) return a.num - b.num;
+        // Fallback to label comparison if section numbers are equal
+        return a.set.label.localeCompare(b.set.label);
+      })
+      .map((entry) => entry.set);
+
+    const csvLines = [CSV_HEADER_LINE];
+    // data URI -> placeholder, so repeated images are stored once
+    const imageIds = new Map();
 
     // Generate unique hierarchical paths and fix metadata
     let questionNumber = 1; // Track question number across all sets
     
-    setsSorted.forEach((set, setIndex) => {
-      const questions = (bySet[set.id] || []).sort(
-        (a, b) => (a.order || 0) - (b.order || 0)
-      );
+    const totalQuestions = state.questions.length;
+    let processed = 0;
+    // Fallbacks for questions saved without exam metadata
+    const defaultExam = state.exam.exam;
+    const defaultSubject = state.exam.subject;
+    // Read before the first yield; the exam field stays editable meanwhile
+    const examClean = (state.exam.exam || "questions").replace(/\s+/g, "_");
+
+    for (const [setIndex, set] of setsSorted.entries()) {
+      const questions = bySet[set.id] || [];
 
       // Extract section number from set (1-18)
       const sectionNum = (() => {
@@ -1607,8 +1987,9 @@ async function handleExportExcel() {
         }
         return setIndex + 1; // Fallback to index-based
       })();
+      const sectionCode = `S${String(sectionNum).padStart(2, '0')}`;
 
-      questions.forEach((q, qIndex) => {
+      for (const q of questions) {
         // Determine if this is a section header (answer_type 0) or a question
         const isSectionHeader = q.answer_type === 0;
         const isQuestion = q.answer_type === 1 || q.answer_type === 2;
@@ -1618,9 +1999,9 @@ async function handleExportExcel() {
         // Format: S01 for section headers
         let uniquePath;
         if (isSectionHeader) {
-          uniquePath = `S${String(sectionNum).padStart(2, '0')}`;
+          uniquePath = sectionCode;
         } else {
-          uniquePath = `S${String(sectionNum).padStart(2, '0')}.Q${String(questionNumber).padStart(2, '0')}`;
+          uniquePath = `${sectionCode}.Q${String(questionNumber).padStart(2, '0')}`;
           questionNumber++;
         }
         
@@ -1639,40 +2020,35 @@ async function handleExportExcel() {
           : normalizeHtmlForExport(q.text_body || "", false, true);  // Plain text for questions
         const normalizedMarkScheme = normalizeHtmlForExport(q.mark_scheme || "", true, false);
         
-        const textHtml = transformHtmlForCsv(normalizedTextBody, zip);
-        const markHtml = transformHtmlForCsv(normalizedMarkScheme, zip);
+        const textHtml = transformHtmlForCsv(normalizedTextBody, zip, imageIds);
+        const markHtml = transformHtmlForCsv(normalizedMarkScheme, zip, imageIds);
 
-        const row = [
+        csvLines.push(toCsvLine([
           q.uniqueid,
           uniquePath, // Use generated unique path
           textHtml,
           q.answer_type,
           markHtml,
-          String(!!q.needs_context).toLowerCase(),
-          q.exam || state.exam.exam,
-          q.subject || state.exam.subject,
+          q.needs_context ? "true" : "false",
+          q.exam || defaultExam,
+          q.subject || defaultSubject,
           sectionValue, // Populated section (1-18)
           topicValue,   // Populated topic (section title)
           q.order ?? "",
           q.marks ?? "", // Preserve user-entered marks value
-        ];
-        rows.push(row);
-      });
-    });
+        ]));
+
+        // Normalization is DOM-heavy; let the page repaint periodically
+        processed++;
+        if (processed % EXPORT_YIELD_EVERY === 0) {
+          updateStatus(`Generating Excel file... (${processed}/${totalQuestions})`);
+          await yieldToBrowser();
+        }
+      }
+    }
 
-    // Build CSV content (quote all fields, preserve HTML)
-    const csvLines = rows.map((row) =>
-      row
-        .map((value) => {
-          const str = value == null ? "" : String(value);
-          const escaped = str.replace(/"/g, '""');
-          return `"${escaped}"`;
-        })
-        .join(",")
-    );
     const csvContent = csvLines.join("\r\n");
 
-    const examClean = (state.exam.exam || "questions").replace(/\s+/g, "_");
     const csvFilename = `${examClean}_questions.csv`;
 
     // Add UTF-8 BOM to ensure proper character encoding recognition
@@ -1680,11 +2056,21 @@ async function handleExportExcel() {
     const utf8BOM = "\uFEFF";
     const csvContentWithBOM = utf8BOM + csvContent;
 
-    // Put CSV inside zip with UTF-8 encoding (BOM ensures proper character encoding)
-    zip.file(csvFilename, csvContentWithBOM);
-
-    // Generate zip (CSV + images folder)
-    const zipBlob = await zip.generateAsync({ type: "blob" });
+    // Put CSV inside zip with UTF-8 encoding (BOM ensures proper character encoding).
+    // The HTML-heavy CSV compresses well; images are already compressed
+    // formats and stay STORE (JSZip's default) to avoid wasted work.
+    zip.file(csvFilename, csvContentWithBOM, { compression: "DEFLATE" });
+
+    // Generate zip (CSV + images folder). JSZip builds the archive
+    // asynchronously in chunks; report its progress.
+    let lastPercent = -1;
+    const zipBlob = await zip.generateAsync({ type: "blob" }, (metadata) => {
+      const percent = Math.floor(metadata.percent);
+      if (percent !== lastPercent) {
+        lastPercent = percent;
+        updateStatus(`Building zip... ${percent}%`);
+      }
+    });
     const zipFilename = `${examClean}_questions_with_images.zip`;
 
     const url = URL.createObjectURL(zipBlob);
@@ -1701,23 +2087,42 @@ async function handleExportExcel() {
     console.error("Export error:", err);
     alert("Failed to export CSV file: " + err.message);
   } finally {
+    exportInProgress = false;
     exportExcelBtn.disabled = false;
+    clearAllBtn.disabled = false;
   }
 }
 
+// Decode a base64 string to bytes; throws on malformed input
+function decodeBase64(base64Data) {
+  if (typeof Uint8Array.fromBase64 === "function") {
+    return Uint8Array.fromBase64(base64Data);
+  }
+  const binaryString = atob(base64Data);
+  const len = binaryString.length;
+  const bytes = new Uint8Array(len);
+  for (let i = 0; i < len; i++) {
+    bytes[i] = binaryString.charCodeAt(i);
+  }
+  return bytes;
+}
+
 /**
  * Transform HTML for CSV export:
  * - Keep HTML tags so bold/italic/paragraphs are preserved.
  * - Replace each inline <img src="data:..."> with a unique placeholder string
  *   like //image:UUID...
  * - Decode each image and add it to the zip under images//image:UUID...
+ * - Identical images (same data URI) share one placeholder and one zip entry
+ *   per export, tracked in imageIds (data URI -> placeholder)
  * Note: HTML should be normalized before calling this function
  */
-function transformHtmlForCsv(html, zip) {
+function transformHtmlForCsv(html, zip, imageIds) {
   if (!html) return "";
+  // Plain text (common for question bodies) cannot contain images
+  if (!HTML_SIGNIFICANT_CHARS_RE.test(html)) return html;
 
-  const tempDiv = document.createElement("div");
-  tempDiv.innerHTML = html;
+  const tempDiv = parseHtmlFragment(html);
 
   const imgElements = tempDiv.querySelectorAll("img");
   imgElements.forEach((img) => {
@@ -1727,28 +2132,30 @@ function transformHtmlForCsv(html, zip) {
       return;
     }
 
-    // Generate unique image ID placeholder
-    const imageId = `//image:${uuid()}`;
-
-    // Decode base64 data and add image file into the zip
-    try {
-      const base64Data = src.split(",")[1];
-      if (!base64Data) {
-        throw new Error("No base64 data in image src");
-      }
+    let imageId = imageIds.get(src);
+    if (!imageId) {
+      // Generate unique image ID placeholder
+      imageId = `//image:${uuid()}`;
+      imageIds.set(src, imageId);
+
+      // Decode base64 data and add image file into the zip. Decoding here
+      // (not lazily in generateAsync) means a malformed data URI only skips
+      // this image instead of failing the whole export.
+      try {
+        // Slice after the "data:image/...;base64," header rather than
+        // split(), which would scan and copy the whole payload into an array
+        const comma = src.indexOf(",");
+        const base64Data = comma === -1 ? "" : src.slice(comma + 1);
+        if (!base64Data) {
+          throw new Error("No base64 data in image src");
+        }
 
-      const binaryString = atob(base64Data);
-      const len = binaryString.length;
-      const bytes = new Uint8Array(len);
-      for (let i = 0; i < len; i++) {
-        bytes[i] = binaryString.charCodeAt(i);
+        // Store under images/ with filename equal to the placeholder ID
+        const imagePath = `images/${imageId}`;
+        zip.file(imagePath, decodeBase64(base64Data));
+      } catch (err) {
+        console.warn("Failed to decode/export image for CSV:", err);
       }
-
-      // Store under images/ with filename equal to the placeholder ID
-      const imagePath = `images/${imageId}`;
-      zip.file(imagePath, bytes);
-    } catch (err) {
-      console.warn("Failed to decode/export image for CSV:", err);
     }
 
     // Replace the <img> with the placeholder text node so the marker
@@ -1765,6 +2172,7 @@ function transformHtmlForCsv(html, zip) {
 
 // ==== CLEAR ALL ====
 function handleClearAll() {
+  if (isExportBusy()) return;
   if (!state.sets.length && !state.questions.length) return;
   const ok = window.confirm(
     "This will remove all sets and questions currently entered. Proceed?"
@@ -1858,11 +2266,14 @@ function init() {
   const hasSavedState = loadStateFromStorage();
   if (hasSavedState) {
     // Validate currentSetId - ensure it matches an existing set
-    if (state.currentSetId && !state.sets.find(s => s.id === state.currentSetId)) {
+    if (state.currentSetId && !getSetById(state.currentSetId)) {
       console.warn("currentSetId doesn't match any set, resetting to first set or null");
       state.currentSetId = state.sets.length > 0 ? state.sets[0].id : null;
     }
     
+    // Older saves may have gaps in order numbers; moves rely on 1..n per set
+    recalcOrders();
+
     restoreFormFromState();
     // Restore UI after loading state
     renderSetsList();
@@ -1882,15 +2293,20 @@ function init() {
     state.exam.subject = subjectEl.value;
     saveStateToStorage();
   });
-  // Use both input and change events for exam field to ensure it saves
+  // Use both input and change events for exam field to ensure it saves;
+  // keystrokes are debounced and the change event flushes immediately
   examEl.addEventListener("input", () => {
     state.exam.exam = examEl.value;
-    saveStateToStorage();
+    scheduleSave();
   });
   examEl.addEventListener("change", () => {
     state.exam.exam = examEl.value;
     saveStateToStorage();
   });
+  // Don't lose a debounced save when the tab is closed mid-typing
+  window.addEventListener("pagehide", () => {
+    if (pendingSaveTimer !== null) saveStateToStorage();
+  });
 
   // Rich-text toolbar wiring
   document.querySelectorAll(".editor-toolbar").forEach((toolbar) => {
@@ -1936,6 +2352,8 @@ function init() {
       const files = e.dataTransfer.files;
       if (files && files.length > 0) {
         const file = files[0];
+        // Same rule as the toolbar picker (accept="image/*"); formats that
+        // can't be re-encoded (SVG, GIF, ...) are inserted as-is
         if (file.type.startsWith("image/")) {
           insertImageIntoEditor(editor.id, file);
         }
@@ -1981,6 +2399,9 @@ function init() {
     clearEditMode();
   });
 
+  // Preview row buttons and drag/drop
+  initPreviewEvents();
+
   // Export & clear
   exportExcelBtn.addEventListener("click", (e) => {
     e.preventDefault();